@@ -2,18 +2,34 @@
 Collections API endpoints for managing indexed codebases.
 """
 
-import subprocess
+import asyncio
 from typing import List
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from models.schemas import CollectionInfo, ErrorResponse
 from services.qdrant_service import get_qdrant_service
+from services.response_cache import (
+    get_cached_response,
+    set_cached_response,
+    invalidate_collection,
+)
+from services.semantic_cache import semantic_cache
 
 router = APIRouter()
 
+# Bytes of indexer stderr kept for the failure message
+INDEXER_STDERR_TAIL_BYTES = 4096
+
+
+def invalidate_collection_caches(collection_name: str) -> None:
+    """Drop every cached view of a collection after it changes."""
+    invalidate_collection(collection_name)
+    semantic_cache.invalidate_collection(collection_name)
+    get_qdrant_service().invalidate_collection(collection_name)
+
 
 @router.get("/", response_model=List[CollectionInfo])
 async def list_collections():
@@ -25,11 +41,18 @@ async def list_collections():
     """
     try:
         service = get_qdrant_service()
-        collection_names = service.list_collections()
+        collection_names = await asyncio.to_thread(service.list_collections_cached)
+
+        # Fetch info for all collections concurrently
+        infos = await asyncio.gather(
+            *[
+                asyncio.to_thread(service.get_collection_info_cached, name)
+                for name in collection_names
+            ]
+        )
 
         collections = []
-        for name in collection_names:
-            info = service.get_collection_info(name)
+        for name, info in zip(collection_names, infos):
 
             # Determine health status
             health = "healthy"
@@ -69,7 +92,7 @@ async def get_collection(collection_name: str):
     """
     try:
         service = get_qdrant_service()
-        info = service.get_collection_info(collection_name)
+        info = await asyncio.to_thread(service.get_collection_info_cached, collection_name)
 
         if info.get("error"):
             raise HTTPException(status_code=404, detail=f"Collection not found: {collection_name}")
@@ -107,14 +130,18 @@ async def get_collection_stats(collection_name: str):
         Detailed statistics dictionary.
     """
     try:
+        cached = get_cached_response(collection_name, "stats")
+        if cached is not None:
+            return cached
+
         service = get_qdrant_service()
-        info = service.get_collection_info(collection_name)
+        info = await asyncio.to_thread(service.get_collection_info_cached, collection_name)
 
         if info.get("error"):
             raise HTTPException(status_code=404, detail=f"Collection not found: {collection_name}")
 
         # Get entity breakdown by type
-        entities, _ = service.get_graph_data(collection_name, limit=1000)
+        entities, _ = await asyncio.to_thread(service.get_graph_data, collection_name, limit=1000)
 
         entity_breakdown = {}
         for entity in entities:
@@ -127,7 +154,7 @@ async def get_collection_stats(collection_name: str):
             if entity.file_path:
                 file_paths.add(entity.file_path)
 
-        return {
+        stats = {
             "collection": collection_name,
             "total_entities": info.get("entity_count", 0),
             "total_relations": info.get("relation_count", 0),
@@ -139,6 +166,9 @@ async def get_collection_stats(collection_name: str):
             "status": info.get("status"),
             "config": info.get("config"),
         }
+        set_cached_response(collection_name, "stats", stats)
+
+        return stats
     except HTTPException:
         raise
     except Exception as e:
@@ -166,25 +196,43 @@ async def reindex_collection(
         service = get_qdrant_service()
 
         # Check if collection exists
-        info = service.get_collection_info(collection_name)
+        info = await asyncio.to_thread(service.get_collection_info, collection_name)
         if info.get("error"):
             raise HTTPException(status_code=404, detail=f"Collection not found: {collection_name}")
 
         # Start indexing in background
-        def run_indexer():
-            """Run the indexer command."""
+        async def run_indexer():
+            """Run the indexer command without buffering its output."""
             try:
                 cmd = ["claude-indexer", "index", "-c", collection_name]
                 if project_path:
                     cmd.extend(["-p", project_path])
 
-                subprocess.run(cmd, check=True, capture_output=True, text=True)
-            except subprocess.CalledProcessError as e:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                # Drain stderr as it is written, keeping only the tail for
+                # the failure message
+                stderr_tail = b""
+                while chunk := await proc.stderr.read(4096):
+                    stderr_tail = (stderr_tail + chunk)[-INDEXER_STDERR_TAIL_BYTES:]
+                await proc.wait()
+                if proc.returncode:
+                    print(
+                        f"Indexing failed with exit code {proc.returncode}: "
+                        f"{stderr_tail.decode(errors='replace').strip()}"
+                    )
+            except OSError as e:
                 print(f"Indexing failed: {e}")
+            finally:
+                invalidate_collection_caches(collection_name)
 
         background_tasks.add_task(run_indexer)
+        invalidate_collection_caches(collection_name)
 
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "message": f"Reindexing started for collection '{collection_name}'",
                 "collection": collection_name,
@@ -197,6 +245,40 @@ async def reindex_collection(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{collection_name}/quantize")
+async def quantize_collection(collection_name: str):
+    """
+    Enable int8 scalar quantization for a collection's dense vectors.
+
+    Args:
+        collection_name: Name of the collection.
+
+    Returns:
+        Status message.
+    """
+    try:
+        service = get_qdrant_service()
+
+        info = await asyncio.to_thread(service.get_collection_info, collection_name)
+        if info.get("error"):
+            raise HTTPException(status_code=404, detail=f"Collection not found: {collection_name}")
+
+        await asyncio.to_thread(service.enable_quantization, collection_name)
+        invalidate_collection_caches(collection_name)
+
+        return ORJSONResponse(
+            content={
+                "message": f"Quantization enabled for collection '{collection_name}'",
+                "collection": collection_name,
+                "quantization": "int8",
+            }
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{collection_name}")
 async def delete_collection(collection_name: str):
     """
@@ -212,14 +294,15 @@ async def delete_collection(collection_name: str):
         service = get_qdrant_service()
 
         # Check if collection exists
-        info = service.get_collection_info(collection_name)
+        info = await asyncio.to_thread(service.get_collection_info, collection_name)
         if info.get("error"):
             raise HTTPException(status_code=404, detail=f"Collection not found: {collection_name}")
 
         # Delete the collection
-        service.client.delete_collection(collection_name)
+        await asyncio.to_thread(service.client.delete_collection, collection_name)
+        invalidate_collection_caches(collection_name)
 
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "message": f"Collection '{collection_name}' deleted successfully",
                 "collection": collection_name,
@@ -2,23 +2,59 @@
 Entities API endpoints for managing entities in the knowledge graph.
 """
 
-from typing import List, Optional
+import asyncio
+import os
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
 
-from models.schemas import Entity, ImplementationResponse, EntityType
+from models.schemas import (
+    Entity,
+    EntityPage,
+    ImplementationResponse,
+    EntityType,
+    RelationType,
+)
+from models.responses import ModelResponse
 from services.qdrant_service import get_qdrant_service
 
 router = APIRouter()
 
-
-@router.get("/", response_model=List[Entity])
+# File extension -> language for syntax highlighting
+EXT_LANG = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".java": "java",
+    ".go": "go",
+    ".rs": "rust",
+}
+
+# (direction, relation type) -> usage bucket, where direction is "from" when
+# the entity is the relation source and "to" when it is the target
+USAGE_BUCKETS = {
+    ("from", RelationType.CALLS): "callees",
+    ("from", RelationType.IMPORTS): "imports",
+    ("to", RelationType.CALLS): "callers",
+    ("to", RelationType.IMPORTS): "imported_by",
+}
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Union[int, str]]:
+    """Convert a page cursor back to the Qdrant point ID it wraps."""
+    if cursor is None:
+        return None
+    return int(cursor) if cursor.isdigit() else cursor
+
+
+@router.get("/", response_model=EntityPage)
 async def list_entities(
     collection: str = Query(..., description="Collection name"),
     entity_types: Optional[List[EntityType]] = Query(None, description="Filter by entity types"),
     limit: int = Query(50, ge=1, le=500, description="Maximum entities to return"),
-    offset: int = Query(0, ge=0, description="Pagination offset"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
 ):
     """
     List entities in a collection with optional filtering.
@@ -27,23 +63,29 @@ async def list_entities(
         collection: Collection name.
         entity_types: Optional filter by entity types.
         limit: Maximum number of entities to return.
-        offset: Pagination offset.
+        cursor: Opaque cursor for the page to fetch; omit for the first page.
 
     Returns:
-        List of entities.
+        Page of entities with the cursor for the next page.
     """
     try:
         service = get_qdrant_service()
 
-        # Get entities from graph data
-        entities, _ = service.get_graph_data(
+        # Let Qdrant paginate so only this page is transferred
+        entities, next_page_offset = await asyncio.to_thread(
+            service.list_entities,
             collection=collection,
             entity_types=entity_types,
-            limit=limit + offset,
+            limit=limit,
+            page_offset=_decode_cursor(cursor),
         )
 
-        # Apply pagination
-        return entities[offset : offset + limit]
+        return ModelResponse(
+            EntityPage(
+                entities=entities,
+                next_cursor=str(next_page_offset) if next_page_offset is not None else None,
+            )
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -65,7 +107,7 @@ async def get_entity(
     """
     try:
         service = get_qdrant_service()
-        entity = service.get_entity(collection, entity_name)
+        entity = await asyncio.to_thread(service.get_entity_cached, collection, entity_name)
 
         if not entity:
             raise HTTPException(status_code=404, detail=f"Entity not found: {entity_name}")
@@ -98,12 +140,14 @@ async def get_entity_implementation(
         service = get_qdrant_service()
 
         # Get the entity
-        entity = service.get_entity(collection, entity_name)
+        entity = await asyncio.to_thread(service.get_entity_cached, collection, entity_name)
         if not entity:
             raise HTTPException(status_code=404, detail=f"Entity not found: {entity_name}")
 
         # Get implementation
-        implementation = service.get_implementation(collection, entity_name)
+        implementation = await asyncio.to_thread(
+            service.get_implementation, collection, entity_name
+        )
         if not implementation:
             implementation = "// Implementation not available"
 
@@ -113,35 +157,22 @@ async def get_entity_implementation(
 
         if scope in ["logical", "dependencies"]:
             # Get relations for this entity
-            relations = service.get_relations(collection, entity_name)
-
-            for relation in relations:
-                if relation.from_entity == entity_name:
-                    # This entity calls/uses another
-                    dep_entity = service.get_entity(collection, relation.to_entity)
-                    if dep_entity:
-                        dependencies.append(dep_entity)
-                else:
-                    # Another entity calls/uses this
-                    caller_entity = service.get_entity(collection, relation.from_entity)
-                    if caller_entity:
-                        callers.append(caller_entity)
+            relations = await asyncio.to_thread(service.get_relations, collection, entity_name)
+
+            # Entities this one calls/uses, and entities that call/use this one
+            dep_names = [r.to_entity for r in relations if r.from_entity == entity_name]
+            caller_names = [r.from_entity for r in relations if r.from_entity != entity_name]
+
+            # Resolve each distinct related entity once, in a single lookup
+            entity_map = await asyncio.to_thread(
+                service.get_entities_bulk, collection, list({*dep_names, *caller_names})
+            )
+            dependencies = [entity_map[name] for name in dep_names if name in entity_map]
+            callers = [entity_map[name] for name in caller_names if name in entity_map]
 
         # Determine language from file extension
-        language = "plaintext"
-        if entity.file_path:
-            if entity.file_path.endswith(".py"):
-                language = "python"
-            elif entity.file_path.endswith((".js", ".jsx")):
-                language = "javascript"
-            elif entity.file_path.endswith((".ts", ".tsx")):
-                language = "typescript"
-            elif entity.file_path.endswith(".java"):
-                language = "java"
-            elif entity.file_path.endswith(".go"):
-                language = "go"
-            elif entity.file_path.endswith(".rs"):
-                language = "rust"
+        ext = os.path.splitext(entity.file_path or "")[1].lower()
+        language = EXT_LANG.get(ext, "plaintext")
 
         return ImplementationResponse(
             entity=entity,
@@ -175,12 +206,12 @@ async def get_entity_relations(
         service = get_qdrant_service()
 
         # Check entity exists
-        entity = service.get_entity(collection, entity_name)
+        entity = await asyncio.to_thread(service.get_entity_cached, collection, entity_name)
         if not entity:
             raise HTTPException(status_code=404, detail=f"Entity not found: {entity_name}")
 
         # Get all relations for this entity
-        relations = service.get_relations(collection, entity_name)
+        relations = await asyncio.to_thread(service.get_relations, collection, entity_name)
 
         # Separate incoming and outgoing
         incoming = []
@@ -232,30 +263,30 @@ async def get_entity_usage(
         service = get_qdrant_service()
 
         # Check entity exists
-        entity = service.get_entity(collection, entity_name)
+        entity = await asyncio.to_thread(service.get_entity_cached, collection, entity_name)
         if not entity:
             raise HTTPException(status_code=404, detail=f"Entity not found: {entity_name}")
 
         # Get relations
-        relations = service.get_relations(collection, entity_name)
+        relations = await asyncio.to_thread(service.get_relations, collection, entity_name)
 
-        # Analyze usage patterns
-        callers = set()
-        callees = set()
-        imports = set()
-        imported_by = set()
+        # Analyze usage patterns in a single pass
+        usage = {bucket: set() for bucket in USAGE_BUCKETS.values()}
 
         for relation in relations:
             if relation.from_entity == entity_name:
-                if relation.relation_type == "calls":
-                    callees.add(relation.to_entity)
-                elif relation.relation_type == "imports":
-                    imports.add(relation.to_entity)
+                bucket = USAGE_BUCKETS.get(("from", relation.relation_type))
+                other = relation.to_entity
             else:
-                if relation.relation_type == "calls":
-                    callers.add(relation.from_entity)
-                elif relation.relation_type == "imports":
-                    imported_by.add(relation.from_entity)
+                bucket = USAGE_BUCKETS.get(("to", relation.relation_type))
+                other = relation.from_entity
+            if bucket:
+                usage[bucket].add(other)
+
+        callers = usage["callers"]
+        callees = usage["callees"]
+        imports = usage["imports"]
+        imported_by = usage["imported_by"]
 
         return {
             "entity": entity_name,
@@ -2,9 +2,11 @@
 Graph API endpoints for visualization data.
 """
 
-from typing import List, Optional
-import hashlib
+import asyncio
+from collections import Counter, defaultdict
+from typing import Optional
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
 
 from models.schemas import (
@@ -13,24 +15,31 @@ from models.schemas import (
     GraphNode,
     GraphEdge,
     EntityType,
-    RelationType,
 )
+from models.responses import ModelResponse
 from services.qdrant_service import get_qdrant_service
+from services.response_cache import get_cached_response, set_cached_response
 
 router = APIRouter()
 
 
-def calculate_node_size(entity, all_relations) -> int:
+def calculate_node_degrees(relations) -> Counter:
+    """
+    Count connections per entity name in a single pass over relations.
+    """
+    degrees = Counter()
+    for r in relations:
+        degrees[r.from_entity] += 1
+        degrees[r.to_entity] += 1
+    return degrees
+
+
+def calculate_node_size(entity, degrees: Counter) -> int:
     """
     Calculate node size based on its connections and importance.
     """
-    connection_count = sum(
-        1
-        for r in all_relations
-        if r.from_entity == entity.name or r.to_entity == entity.name
-    )
     # Base size 10, +2 per connection, max 50
-    return min(10 + (connection_count * 2), 50)
+    return min(10 + (degrees[entity.name] * 2), 50)
 
 
 def get_entity_group(entity_type: EntityType) -> int:
@@ -64,10 +73,22 @@ async def get_graph_data(request: GraphRequest):
         Graph data with nodes and edges.
     """
     try:
+        cache_key = (
+            "graph",
+            request.entity,
+            tuple(request.entity_types or ()),
+            request.depth,
+            request.limit,
+        )
+        cached = get_cached_response(request.collection, cache_key)
+        if cached is not None:
+            return ModelResponse(cached)
+
         service = get_qdrant_service()
 
         # Get entities and relations
-        entities, relations = service.get_graph_data(
+        entities, relations = await asyncio.to_thread(
+            service.get_graph_data,
             collection=request.collection,
             entity=request.entity,
             entity_types=request.entity_types,
@@ -76,26 +97,30 @@ async def get_graph_data(request: GraphRequest):
         )
 
         if not entities:
-            return GraphData(
-                nodes=[],
-                edges=[],
-                metadata={
-                    "message": "No entities found",
-                    "collection": request.collection,
-                },
+            return ModelResponse(
+                GraphData(
+                    nodes=[],
+                    edges=[],
+                    metadata={
+                        "message": "No entities found",
+                        "collection": request.collection,
+                    },
+                )
             )
 
-        # Create nodes
+        # Nodes and edges are built from our own entities and relations,
+        # so construct them without re-validating each field
         nodes = []
         entity_names = set()
+        degrees = calculate_node_degrees(relations)
         for entity in entities:
             entity_names.add(entity.name)
             nodes.append(
-                GraphNode(
+                GraphNode.model_construct(
                     id=entity.name,
                     name=entity.name,
                     entity_type=entity.entity_type,
-                    size=calculate_node_size(entity, relations),
+                    size=calculate_node_size(entity, degrees),
                     group=get_entity_group(entity.entity_type),
                     metadata={
                         "file_path": entity.file_path,
@@ -111,7 +136,7 @@ async def get_graph_data(request: GraphRequest):
         for relation in relations:
             if relation.from_entity in entity_names and relation.to_entity in entity_names:
                 edges.append(
-                    GraphEdge(
+                    GraphEdge.model_construct(
                         source=relation.from_entity,
                         target=relation.to_entity,
                         relation_type=relation.relation_type,
@@ -119,7 +144,7 @@ async def get_graph_data(request: GraphRequest):
                     )
                 )
 
-        return GraphData(
+        graph_data = GraphData.model_construct(
             nodes=nodes,
             edges=edges,
             metadata={
@@ -129,6 +154,9 @@ async def get_graph_data(request: GraphRequest):
                 "centered_on": request.entity,
             },
         )
+        set_cached_response(request.collection, cache_key, graph_data)
+
+        return ModelResponse(graph_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -153,10 +181,16 @@ async def get_graph_layouts(
         Graph data with layout positions.
     """
     try:
+        cache_key = ("layout", layout_type, entity, limit)
+        cached = get_cached_response(collection, cache_key)
+        if cached is not None:
+            return cached
+
         service = get_qdrant_service()
 
         # Get graph data
-        entities, relations = service.get_graph_data(
+        entities, relations = await asyncio.to_thread(
+            service.get_graph_data,
             collection=collection,
             entity=entity,
             limit=limit,
@@ -166,39 +200,41 @@ async def get_graph_layouts(
         edges = []
         entity_names = set()
 
+        # Calculate positions for all nodes at once based on layout type
+        n = len(entities)
+        i = np.arange(n)
+        if layout_type == "hierarchical":
+            # Simple hierarchical layout based on file path depth
+            depths = np.fromiter(
+                (e.file_path.count("/") if e.file_path else 0 for e in entities),
+                dtype=np.int32,
+                count=n,
+            )
+            xs = (i % 10) * 100
+            ys = depths * 150
+        elif layout_type == "radial":
+            # Radial layout
+            angles = 2 * np.pi * i / max(n, 1)
+            radii = 200 + (i % 3) * 100
+            xs = radii * np.cos(angles)
+            ys = radii * np.sin(angles)
+        else:  # force
+            # Initial random positions for force-directed layout
+            rng = np.random.default_rng(0)
+            xs, ys = rng.uniform(-300, 300, size=(2, n))
+
         # Create basic graph structure
-        for i, entity in enumerate(entities):
+        degrees = calculate_node_degrees(relations)
+        for entity, x, y in zip(entities, xs.tolist(), ys.tolist()):
             entity_names.add(entity.name)
 
-            # Calculate position based on layout type
-            if layout_type == "hierarchical":
-                # Simple hierarchical layout based on file path depth
-                depth = entity.file_path.count("/") if entity.file_path else 0
-                x = (i % 10) * 100
-                y = depth * 150
-            elif layout_type == "radial":
-                # Radial layout
-                import math
-
-                angle = (2 * math.pi * i) / max(len(entities), 1)
-                radius = 200 + (i % 3) * 100
-                x = radius * math.cos(angle)
-                y = radius * math.sin(angle)
-            else:  # force
-                # Initial random positions for force-directed layout
-                import random
-
-                random.seed(i)
-                x = random.uniform(-300, 300)
-                y = random.uniform(-300, 300)
-
             nodes.append({
                 "id": entity.name,
                 "name": entity.name,
                 "type": entity.entity_type,
                 "x": x,
                 "y": y,
-                "size": calculate_node_size(entity, relations),
+                "size": calculate_node_size(entity, degrees),
                 "group": get_entity_group(entity.entity_type),
             })
 
@@ -211,17 +247,20 @@ async def get_graph_layouts(
                     "type": relation.relation_type,
                 })
 
-        return {
+        layout = {
             "layout_type": layout_type,
             "nodes": nodes,
             "edges": edges,
             "bounds": {
-                "min_x": min(n["x"] for n in nodes) if nodes else 0,
-                "max_x": max(n["x"] for n in nodes) if nodes else 0,
-                "min_y": min(n["y"] for n in nodes) if nodes else 0,
-                "max_y": max(n["y"] for n in nodes) if nodes else 0,
+                "min_x": xs.min().item() if n else 0,
+                "max_x": xs.max().item() if n else 0,
+                "min_y": ys.min().item() if n else 0,
+                "max_y": ys.max().item() if n else 0,
             },
         }
+        set_cached_response(collection, cache_key, layout)
+
+        return layout
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -242,59 +281,72 @@ async def get_graph_clusters(
         Cluster information.
     """
     try:
+        cache_key = ("clusters", min_cluster_size)
+        cached = get_cached_response(collection, cache_key)
+        if cached is not None:
+            return cached
+
         service = get_qdrant_service()
 
         # Get all entities and relations
-        entities, relations = service.get_graph_data(
+        entities, relations = await asyncio.to_thread(
+            service.get_graph_data,
             collection=collection,
             limit=500,
         )
 
-        # Build adjacency list
-        adjacency = {}
-        for entity in entities:
-            adjacency[entity.name] = set()
+        # Union-find over entities for connected components
+        parent = {entity.name: entity.name for entity in entities}
+        rank = dict.fromkeys(parent, 0)
+
+        def find(node):
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            # Path compression
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        def union(a, b):
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                return
+            if rank[root_a] < rank[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            if rank[root_a] == rank[root_b]:
+                rank[root_a] += 1
 
         for relation in relations:
-            if relation.from_entity in adjacency:
-                adjacency[relation.from_entity].add(relation.to_entity)
-            if relation.to_entity in adjacency:
-                adjacency[relation.to_entity].add(relation.from_entity)
+            if relation.from_entity in parent and relation.to_entity in parent:
+                union(relation.from_entity, relation.to_entity)
 
-        # Simple clustering based on connected components
-        visited = set()
-        clusters = []
-
-        def dfs(node, cluster):
-            if node in visited:
-                return
-            visited.add(node)
-            cluster.add(node)
-            for neighbor in adjacency.get(node, []):
-                dfs(neighbor, cluster)
+        # Group entities by component root
+        components = {}
+        for name in parent:
+            components.setdefault(find(name), []).append(name)
 
-        for entity in entities:
-            if entity.name not in visited:
-                cluster = set()
-                dfs(entity.name, cluster)
-                if len(cluster) >= min_cluster_size:
-                    clusters.append(list(cluster))
+        clusters = [
+            component
+            for component in components.values()
+            if len(component) >= min_cluster_size
+        ]
+        isolated_count = sum(1 for component in components.values() if len(component) == 1)
 
         # Sort clusters by size
         clusters.sort(key=len, reverse=True)
 
         # Generate cluster metadata
+        entities_by_name = {e.name: e for e in entities}
         cluster_info = []
         for i, cluster_nodes in enumerate(clusters[:10]):  # Top 10 clusters
             # Get entities in this cluster
-            cluster_entities = [e for e in entities if e.name in cluster_nodes]
+            cluster_entities = [entities_by_name[name] for name in cluster_nodes]
 
             # Determine cluster type based on most common entity type
-            type_counts = {}
-            for entity in cluster_entities:
-                type_counts[entity.entity_type] = type_counts.get(entity.entity_type, 0) + 1
-
-            dominant_type = max(type_counts, key=type_counts.get) if type_counts else "mixed"
+            type_counts = Counter(e.entity_type for e in cluster_entities)
+            dominant_type = type_counts.most_common(1)[0][0] if type_counts else "mixed"
 
             cluster_info.append({
                 "id": f"cluster_{i}",
@@ -306,12 +358,15 @@ async def get_graph_clusters(
                 ),
             })
 
-        return {
+        cluster_data = {
             "collection": collection,
             "total_clusters": len(clusters),
             "clusters": cluster_info,
-            "isolated_nodes": len(entities) - len(visited),
+            "isolated_nodes": isolated_count,
         }
+        set_cached_response(collection, cache_key, cluster_data)
+
+        return cluster_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -339,8 +394,10 @@ async def find_paths(
         service = get_qdrant_service()
 
         # Check both entities exist
-        source_entity = service.get_entity(collection, source)
-        target_entity = service.get_entity(collection, target)
+        source_entity, target_entity = await asyncio.gather(
+            asyncio.to_thread(service.get_entity_cached, collection, source),
+            asyncio.to_thread(service.get_entity_cached, collection, target),
+        )
 
         if not source_entity:
             raise HTTPException(status_code=404, detail=f"Source entity not found: {source}")
@@ -348,48 +405,47 @@ async def find_paths(
             raise HTTPException(status_code=404, detail=f"Target entity not found: {target}")
 
         # Get relations for path finding
-        all_relations = service.get_relations(collection)
+        all_relations = await asyncio.to_thread(service.get_relations, collection)
 
-        # Build adjacency list
-        adjacency = {}
+        # Build adjacency list of (to_entity, relation_type) tuples
+        adjacency = defaultdict(list)
         for relation in all_relations:
-            if relation.from_entity not in adjacency:
-                adjacency[relation.from_entity] = []
-            adjacency[relation.from_entity].append({
-                "to": relation.to_entity,
-                "type": relation.relation_type,
-            })
-
-        # BFS to find shortest paths
-        from collections import deque
-
-        queue = deque([(source, [source], [])])
-        visited = {source}
+            adjacency[relation.from_entity].append((relation.to_entity, relation.relation_type))
+
+        # Level-synchronous BFS recording every shortest-path parent
+        dist = {source: 0}
+        parents = {source: []}
+        frontier = [source]
+        depth = 0
+
+        while frontier and target not in dist and depth < max_depth:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for next_node, edge_type in adjacency.get(node, ()):
+                    if next_node not in dist:
+                        dist[next_node] = depth
+                        parents[next_node] = []
+                        next_frontier.append(next_node)
+                    if dist[next_node] == depth:
+                        parents[next_node].append((node, edge_type))
+            frontier = next_frontier
+
+        # Walk parent links back from the target to rebuild up to 5 paths
         paths = []
-
-        while queue and len(paths) < 5:  # Find up to 5 paths
-            current, path, edge_types = queue.popleft()
-
-            if len(path) > max_depth:
-                continue
-
-            if current == target:
-                paths.append({
-                    "path": path,
-                    "edge_types": edge_types,
-                    "length": len(path) - 1,
-                })
-                continue
-
-            for edge in adjacency.get(current, []):
-                next_node = edge["to"]
-                if next_node not in visited or len(path) < max_depth:
-                    queue.append((
-                        next_node,
-                        path + [next_node],
-                        edge_types + [edge["type"]],
-                    ))
-                    visited.add(next_node)
+        if target in dist:
+            stack = [(target, [target], [])]
+            while stack and len(paths) < 5:
+                node, path, edge_types = stack.pop()
+                if node == source:
+                    paths.append({
+                        "path": path[::-1],
+                        "edge_types": edge_types[::-1],
+                        "length": len(path) - 1,
+                    })
+                    continue
+                for prev, edge_type in parents[node]:
+                    stack.append((prev, path + [prev], edge_types + [edge_type]))
 
         return {
             "source": source,
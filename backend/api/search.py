@@ -2,12 +2,22 @@
 Search API endpoints for semantic, keyword, and hybrid search.
 """
 
+import asyncio
+import bisect
+import hashlib
+import re
 import time
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 import numpy as np
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from qdrant_client.models import SparseVector
+
+try:
+    from fastembed import SparseTextEmbedding
+except ImportError:  # Optional: keyword and hybrid search fall back to dense vectors
+    SparseTextEmbedding = None
 
 from models.schemas import (
     SearchRequest,
@@ -17,28 +27,111 @@ from models.schemas import (
     EntityType,
     ChunkType,
 )
+from config import get_settings
+from models.responses import ModelResponse
+from services.embedding_batcher import create_embedding_batcher
 from services.qdrant_service import get_qdrant_service
+from services.semantic_cache import semantic_cache
 
 router = APIRouter()
 
 
+@lru_cache(maxsize=4096)
+def _embed_cached(text: str, dimension: int) -> np.ndarray:
+    """
+    Generate and cache the embedding for a query.
+    The array is read-only because it is shared between requests.
+    """
+    # Seed from a stable digest; hash() differs between processes
+    seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+    rng = np.random.default_rng(seed)
+    embedding = rng.standard_normal(dimension, dtype=np.float32)
+    # Normalize to unit vector in place
+    embedding /= np.linalg.norm(embedding)
+    embedding.setflags(write=False)
+    return embedding
+
+
 # Mock embedding function - in production, use actual embedding service
-def generate_mock_embedding(text: str, dimension: int = 1536) -> List[float]:
+def generate_mock_embedding(text: str, dimension: int = 1536) -> np.ndarray:
     """
-    Generate a mock embedding vector for testing.
+    Generate a mock float32 embedding vector for testing.
     In production, this would call OpenAI or Voyage AI.
+    Repeated queries are served from an LRU cache.
+    """
+    return _embed_cached(text, dimension)
+
+
+def generate_mock_embeddings(texts: List[str], dimension: int = 1536) -> List[np.ndarray]:
     """
-    np.random.seed(hash(text) % 2**32)
-    embedding = np.random.randn(dimension)
-    # Normalize to unit vector
-    embedding = embedding / np.linalg.norm(embedding)
-    return embedding.tolist()
+    Generate mock embeddings for a batch of texts.
+    In production, this would be a single batched OpenAI or Voyage AI call.
+    """
+    return [generate_mock_embedding(text, dimension) for text in texts]
+
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss statistics for the query embedding cache."""
+    return _embed_cached.cache_info()._asdict()
+
+
+@lru_cache(maxsize=1)
+def _get_sparse_model():
+    """Load the BM25 sparse encoder on first use."""
+    return SparseTextEmbedding(get_settings().sparse_model_name)
+
+
+@lru_cache(maxsize=4096)
+def generate_sparse_embedding(text: str) -> Optional[SparseVector]:
+    """
+    Generate a BM25 sparse vector for a query.
+    Returns None when fastembed is not installed.
+    """
+    if SparseTextEmbedding is None:
+        return None
+    embedding = next(iter(_get_sparse_model().query_embed(text)))
+    return SparseVector(
+        indices=embedding.indices.tolist(),
+        values=embedding.values.tolist(),
+    )
+
+
+async def embed_sparse_query(query: str, mode: SearchMode) -> Optional[SparseVector]:
+    """Get the sparse query vector for keyword and hybrid modes."""
+    if mode == SearchMode.SEMANTIC:
+        return None
+    return await asyncio.to_thread(generate_sparse_embedding, query)
+
+
+def highlight_snippet(pattern: re.Pattern, text: Optional[str]) -> Optional[str]:
+    """
+    Get a 200 character window of text around the first query match.
+
+    Args:
+        pattern: Compiled query pattern.
+        text: Text to search.
+
+    Returns:
+        Snippet starting up to 40 characters before the match, or None.
+    """
+    match = pattern.search(text) if text else None
+    if match is None:
+        return None
+    start = max(0, match.start() - 40)
+    return text[start : start + 200]
+
+
+# Coalesces concurrent query embeddings into batched provider calls; the
+# mock provider is an in-memory cache lookup, so it runs on the event loop
+embedder = create_embedding_batcher(generate_mock_embeddings, run_in_thread=False)
 
 
 @router.post("/", response_model=SearchResponse)
 async def search(request: SearchRequest):
     """
     Perform semantic, keyword, or hybrid search across collections.
+    Near-duplicate queries are served from the semantic cache; the
+    X-Cache response header reports hit or miss.
 
     Args:
         request: Search request with query and filters.
@@ -53,7 +146,9 @@ async def search(request: SearchRequest):
 
         # Validate collection exists if specified
         if request.collection:
-            info = service.get_collection_info(request.collection)
+            info = await asyncio.to_thread(
+                service.get_collection_info_cached, request.collection
+            )
             if info.get("error"):
                 raise HTTPException(
                     status_code=404,
@@ -61,7 +156,7 @@ async def search(request: SearchRequest):
                 )
         else:
             # If no collection specified, get first available
-            collections = service.list_collections()
+            collections = await asyncio.to_thread(service.list_collections_cached)
             if not collections:
                 raise HTTPException(
                     status_code=404,
@@ -71,33 +166,66 @@ async def search(request: SearchRequest):
 
         # Generate embedding for the query
         # In production, use actual embedding service based on settings
-        query_embedding = generate_mock_embedding(request.query)
+        query_embedding, sparse_embedding = await asyncio.gather(
+            embedder.embed(request.query),
+            embed_sparse_query(request.query, request.mode),
+        )
 
-        # Perform search
-        entity_results = await service.search_similar(
-            collection=request.collection,
-            query_vector=query_embedding,
-            mode=request.mode,
-            entity_types=request.entity_types,
-            limit=request.limit,
-            include_implementation=request.include_implementation,
+        # Serve near-duplicate queries from the semantic cache. Keyword and
+        # hybrid results also depend on the sparse query, so only queries
+        # with the same sparse vector share entries
+        cache_namespace = (
+            request.collection,
+            request.mode,
+            tuple(request.entity_types or ()),
+            request.include_implementation,
+            request.offset,
+            request.limit,
+            (tuple(sparse_embedding.indices), tuple(sparse_embedding.values))
+            if sparse_embedding is not None
+            else None,
         )
+        entity_results = semantic_cache.get(cache_namespace, query_embedding)
+        cache_status = "hit" if entity_results is not None else "miss"
+
+        if entity_results is None:
+            # Let Qdrant skip to the requested page; one extra result tells
+            # whether another page follows
+            entity_results = await service.search_similar(
+                collection=request.collection,
+                query_vector=query_embedding,
+                mode=request.mode,
+                entity_types=request.entity_types,
+                limit=request.limit + 1,
+                include_implementation=request.include_implementation,
+                offset=request.offset,
+                sparse_vector=sparse_embedding,
+            )
+            semantic_cache.put(cache_namespace, query_embedding, entity_results)
+
+        # Case-insensitive matcher compiled once per request, so entity
+        # text is scanned in place instead of being lowercased per field
+        query_pattern = re.compile(re.escape(request.query), re.IGNORECASE)
+
+        has_more = len(entity_results) > request.limit
 
-        # Convert to search results
+        # Convert to search results, only for the requested page
         results = []
-        for entity, score in entity_results:
+        for entity, score in entity_results[: request.limit]:
             # Generate highlights (simplified - in production, use actual matching)
             highlights = []
-            if entity.docstring and request.query.lower() in entity.docstring.lower():
-                highlights.append(entity.docstring[:200])
-            elif entity.observations:
+            snippet = highlight_snippet(query_pattern, entity.docstring)
+            if snippet is None:
                 for obs in entity.observations:
-                    if request.query.lower() in obs.lower():
-                        highlights.append(obs[:200])
+                    snippet = highlight_snippet(query_pattern, obs)
+                    if snippet is not None:
                         break
+            if snippet is not None:
+                highlights.append(snippet)
 
+            # Scores and entities come from Qdrant, so skip re-validation
             results.append(
-                SearchResult(
+                SearchResult.model_construct(
                     entity=entity,
                     score=score,
                     chunk_type=ChunkType.METADATA,
@@ -108,13 +236,15 @@ async def search(request: SearchRequest):
         # Calculate response time
         took_ms = (time.time() - start_time) * 1000
 
-        return SearchResponse(
-            results=results[request.offset : request.offset + request.limit],
-            total=len(results),
+        search_response = SearchResponse(
+            results=results,
+            total=request.offset + len(results),
+            has_more=has_more,
             query=request.query,
             mode=request.mode,
             took_ms=took_ms,
         )
+        return ModelResponse(search_response, headers={"X-Cache": cache_status})
     except HTTPException:
         raise
     except Exception as e:
@@ -145,8 +275,11 @@ async def search_similar(
     try:
         service = get_qdrant_service()
 
-        # Generate embedding
-        query_embedding = generate_mock_embedding(query)
+        # Generate embeddings
+        query_embedding, sparse_embedding = await asyncio.gather(
+            embedder.embed(query),
+            embed_sparse_query(query, mode),
+        )
 
         # Search
         results = await service.search_similar(
@@ -156,6 +289,7 @@ async def search_similar(
             entity_types=entity_types,
             limit=limit,
             include_implementation=False,
+            sparse_vector=sparse_embedding,
         )
 
         # Format response
@@ -200,23 +334,21 @@ async def get_search_suggestions(
 
         service = get_qdrant_service()
 
-        # Get entities that match the prefix
-        entities, _ = service.get_graph_data(collection, limit=100)
+        # Matching names are contiguous in the sorted index
+        names, entities = await asyncio.to_thread(service.get_entity_name_index, collection)
 
         suggestions = []
         query_lower = query.lower()
+        start = bisect.bisect_left(names, query_lower)
 
-        for entity in entities:
-            # Check if entity name starts with query
-            if entity.name.lower().startswith(query_lower):
-                suggestions.append({
-                    "text": entity.name,
-                    "type": entity.entity_type,
-                    "description": entity.observations[0] if entity.observations else "",
-                })
-
-            if len(suggestions) >= limit:
+        for name, entity in zip(names[start : start + limit], entities[start : start + limit]):
+            if not name.startswith(query_lower):
                 break
+            suggestions.append({
+                "text": entity.name,
+                "type": entity.entity_type,
+                "description": entity.observations[0] if entity.observations else "",
+            })
 
         return suggestions
     except Exception as e:
@@ -245,52 +377,59 @@ async def multi_collection_search(
     try:
         service = get_qdrant_service()
 
-        # Get collections to search
-        if not collections:
-            collections = service.list_collections()
+        # Get collections to search, skipping any that do not exist
+        available = await asyncio.to_thread(service.list_collections_cached)
+        if collections:
+            available_set = set(available)
+            collections = [name for name in collections if name in available_set]
+        else:
+            collections = available
 
         if not collections:
             return {"results": {}, "total": 0}
 
-        # Generate embedding once
-        query_embedding = generate_mock_embedding(query)
-
-        # Search each collection
-        all_results = {}
-        total_count = 0
-
-        for collection_name in collections:
-            try:
-                # Check collection exists
-                info = service.get_collection_info(collection_name)
-                if info.get("error"):
-                    continue
+        # Generate embeddings once
+        query_embedding, sparse_embedding = await asyncio.gather(
+            embedder.embed(query),
+            embed_sparse_query(query, mode),
+        )
 
-                # Search
-                results = await service.search_similar(
+        # Search all collections concurrently
+        results_list = await asyncio.gather(
+            *[
+                service.search_similar(
                     collection=collection_name,
                     query_vector=query_embedding,
                     mode=mode,
                     limit=limit_per_collection,
+                    sparse_vector=sparse_embedding,
                 )
+                for collection_name in collections
+            ],
+            return_exceptions=True,
+        )
+
+        all_results = {}
+        total_count = 0
 
-                collection_results = []
-                for entity, score in results:
-                    collection_results.append({
-                        "entity": entity.name,
-                        "type": entity.entity_type,
-                        "score": score,
-                        "file_path": entity.file_path,
-                    })
-
-                if collection_results:
-                    all_results[collection_name] = collection_results
-                    total_count += len(collection_results)
-
-            except Exception as e:
-                print(f"Error searching collection {collection_name}: {e}")
+        for collection_name, results in zip(collections, results_list):
+            if isinstance(results, Exception):
+                print(f"Error searching collection {collection_name}: {results}")
                 continue
 
+            collection_results = []
+            for entity, score in results:
+                collection_results.append({
+                    "entity": entity.name,
+                    "type": entity.entity_type,
+                    "score": score,
+                    "file_path": entity.file_path,
+                })
+
+            if collection_results:
+                all_results[collection_name] = collection_results
+                total_count += len(collection_results)
+
         return {
             "query": query,
             "mode": mode,
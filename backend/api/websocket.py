@@ -2,54 +2,121 @@
 WebSocket API endpoints for real-time updates.
 """
 
-import json
 import asyncio
-from typing import Dict, Set
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
 
-from models.schemas import WSMessage
+from api.collections import invalidate_collection_caches
+from config import get_settings
+from models.schemas import WSMessage, WSClientMessage
 from services.qdrant_service import get_qdrant_service
 
 router = APIRouter()
 
 
+def build_message(
+    msg_type: str,
+    collection: Optional[str] = None,
+    data: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Serialize a server message to a JSON frame.
+    Fields are built here rather than taken from input, so validation is skipped.
+    """
+    return WSMessage.model_construct(
+        type=msg_type,
+        collection=collection,
+        data=data,
+    ).model_dump_json()
+
+
+# Keep-alive frames carry no per-client data, so serialize one up front
+PING_MESSAGE = build_message("ping")
+
+
 class ConnectionManager:
     """Manages WebSocket connections and subscriptions."""
 
     def __init__(self):
-        # Active connections by client ID
-        self.active_connections: Dict[str, WebSocket] = {}
+        # Active connections by client ID, least recently active first
+        self.active_connections: "OrderedDict[str, WebSocket]" = OrderedDict()
         # Subscriptions: collection -> set of client IDs
         self.subscriptions: Dict[str, Set[str]] = {}
+        # Reverse index: client ID -> set of subscribed collections
+        self.client_subscriptions: Dict[str, Set[str]] = {}
 
     async def connect(self, websocket: WebSocket, client_id: str):
         """Accept and register a new WebSocket connection."""
         await websocket.accept()
+
+        # At capacity, make room by evicting the least recently active client
+        max_connections = get_settings().ws_max_connections
+        if max_connections > 0 and client_id not in self.active_connections:
+            while self.active_connections and len(self.active_connections) >= max_connections:
+                oldest_id, oldest = next(iter(self.active_connections.items()))
+                self.disconnect(oldest_id)
+                try:
+                    await oldest.close(code=1013)  # Try again later
+                except Exception:
+                    pass
+
         self.active_connections[client_id] = websocket
+        self.active_connections.move_to_end(client_id)
+
+    def touch(self, client_id: str):
+        """Mark a client as recently active so it is evicted last."""
+        if client_id in self.active_connections:
+            self.active_connections.move_to_end(client_id)
 
     def disconnect(self, client_id: str):
         """Remove a WebSocket connection and its subscriptions."""
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
+        self.active_connections.pop(client_id, None)
+
+        # Only visit the collections this client subscribed to
+        for collection in self.client_subscriptions.pop(client_id, ()):
+            self._remove_subscriber(collection, client_id)
 
-        # Remove from all subscriptions
-        for collection in self.subscriptions:
-            if client_id in self.subscriptions[collection]:
-                self.subscriptions[collection].discard(client_id)
+    def subscribe(self, client_id: str, collection: str) -> bool:
+        """
+        Subscribe a client to collection updates.
 
-    def subscribe(self, client_id: str, collection: str):
-        """Subscribe a client to collection updates."""
-        if collection not in self.subscriptions:
-            self.subscriptions[collection] = set()
-        self.subscriptions[collection].add(client_id)
+        Args:
+            client_id: Client to subscribe.
+            collection: Collection name.
+
+        Returns:
+            False if the collection is at its subscriber limit.
+        """
+        clients = self.subscriptions.setdefault(collection, set())
+        max_subscribers = get_settings().ws_max_subscribers_per_collection
+        if client_id not in clients and 0 < max_subscribers <= len(clients):
+            return False
+
+        clients.add(client_id)
+        self.client_subscriptions.setdefault(client_id, set()).add(collection)
+        return True
 
     def unsubscribe(self, client_id: str, collection: str):
         """Unsubscribe a client from collection updates."""
-        if collection in self.subscriptions:
-            self.subscriptions[collection].discard(client_id)
+        self._remove_subscriber(collection, client_id)
+
+        collections = self.client_subscriptions.get(client_id)
+        if collections is not None:
+            collections.discard(collection)
+            if not collections:
+                del self.client_subscriptions[client_id]
+
+    def _remove_subscriber(self, collection: str, client_id: str):
+        """Drop a client from a collection, removing the collection once empty."""
+        clients = self.subscriptions.get(collection)
+        if clients is not None:
+            clients.discard(client_id)
+            if not clients:
+                del self.subscriptions[collection]
 
     async def send_personal_message(self, message: str, client_id: str):
         """Send a message to a specific client."""
@@ -59,19 +126,30 @@ class ConnectionManager:
 
     async def broadcast_to_collection(self, message: str, collection: str):
         """Broadcast a message to all clients subscribed to a collection."""
-        if collection in self.subscriptions:
-            disconnected_clients = []
-
-            for client_id in self.subscriptions[collection]:
-                if client_id in self.active_connections:
-                    try:
-                        websocket = self.active_connections[client_id]
-                        await websocket.send_text(message)
-                    except Exception:
-                        disconnected_clients.append(client_id)
-
-            # Clean up disconnected clients
-            for client_id in disconnected_clients:
+        await self._send_to(
+            [
+                (client_id, self.active_connections[client_id])
+                for client_id in self.subscriptions.get(collection, ())
+                if client_id in self.active_connections
+            ],
+            message,
+        )
+
+    async def ping_all(self):
+        """Send a keep-alive ping to every connected client."""
+        await self._send_to(list(self.active_connections.items()), PING_MESSAGE)
+
+    async def _send_to(self, targets: List[Tuple[str, WebSocket]], message: str):
+        """Send a message to many clients, disconnecting those that fail."""
+        # Send to all targets at once so a slow client doesn't delay the rest
+        results = await asyncio.gather(
+            *[websocket.send_text(message) for _, websocket in targets],
+            return_exceptions=True,
+        )
+
+        # Clean up disconnected clients
+        for (client_id, _), result in zip(targets, results):
+            if isinstance(result, Exception):
                 self.disconnect(client_id)
 
 
@@ -79,6 +157,17 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+async def ping_loop():
+    """
+    Keep all WebSocket connections alive from a single task.
+    Started by the application lifespan and cancelled on shutdown.
+    """
+    interval = get_settings().ws_ping_interval
+    while True:
+        await asyncio.sleep(interval)
+        await manager.ping_all()
+
+
 @router.websocket("/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
     """
@@ -92,63 +181,50 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
 
     try:
         # Send welcome message
-        welcome_msg = WSMessage(
-            type="update",
+        welcome_msg = build_message(
+            "update",
             data={
                 "message": f"Connected to Claude Code Memory Explorer WebSocket",
                 "client_id": client_id,
             },
         )
-        await manager.send_personal_message(welcome_msg.model_dump_json(), client_id)
-
-        # Start ping task to keep connection alive
-        async def ping_task():
-            while True:
-                try:
-                    await asyncio.sleep(30)
-                    ping_msg = WSMessage(type="ping")
-                    await manager.send_personal_message(
-                        ping_msg.model_dump_json(),
-                        client_id,
-                    )
-                except Exception:
-                    break
-
-        ping_task_handle = asyncio.create_task(ping_task())
+        await manager.send_personal_message(welcome_msg, client_id)
 
         # Handle incoming messages
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            manager.touch(client_id)
+            # Parse and validate in one pass
+            message = WSClientMessage.model_validate_json(data)
 
-            msg_type = message.get("type")
-            collection = message.get("collection")
+            msg_type = message.type
+            collection = message.collection
 
             if msg_type == "subscribe" and collection:
                 # Subscribe to collection updates
-                manager.subscribe(client_id, collection)
-                response = WSMessage(
-                    type="update",
-                    collection=collection,
-                    data={"message": f"Subscribed to {collection}"},
-                )
-                await manager.send_personal_message(
-                    response.model_dump_json(),
-                    client_id,
-                )
+                if manager.subscribe(client_id, collection):
+                    response = build_message(
+                        "update",
+                        collection=collection,
+                        data={"message": f"Subscribed to {collection}"},
+                    )
+                else:
+                    response = build_message(
+                        "error",
+                        collection=collection,
+                        data={"message": f"Subscriber limit reached for {collection}"},
+                    )
+                await manager.send_personal_message(response, client_id)
 
             elif msg_type == "unsubscribe" and collection:
                 # Unsubscribe from collection
                 manager.unsubscribe(client_id, collection)
-                response = WSMessage(
-                    type="update",
+                response = build_message(
+                    "update",
                     collection=collection,
                     data={"message": f"Unsubscribed from {collection}"},
                 )
-                await manager.send_personal_message(
-                    response.model_dump_json(),
-                    client_id,
-                )
+                await manager.send_personal_message(response, client_id)
 
             elif msg_type == "pong":
                 # Client responded to ping
@@ -156,21 +232,16 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
 
             else:
                 # Echo unknown messages
-                response = WSMessage(
-                    type="error",
+                response = build_message(
+                    "error",
                     data={"message": f"Unknown message type: {msg_type}"},
                 )
-                await manager.send_personal_message(
-                    response.model_dump_json(),
-                    client_id,
-                )
+                await manager.send_personal_message(response, client_id)
 
     except WebSocketDisconnect:
         manager.disconnect(client_id)
-        ping_task_handle.cancel()
     except Exception as e:
         manager.disconnect(client_id)
-        ping_task_handle.cancel()
         print(f"WebSocket error for client {client_id}: {e}")
 
 
@@ -187,16 +258,12 @@ async def broadcast_update(collection: str, message: dict):
     Returns:
         Number of clients notified.
     """
-    update_msg = WSMessage(
-        type="update",
-        collection=collection,
-        data=message,
-    )
+    # The collection changed, so cached metadata and results are stale
+    invalidate_collection_caches(collection)
+
+    update_msg = build_message("update", collection=collection, data=message)
 
-    await manager.broadcast_to_collection(
-        update_msg.model_dump_json(),
-        collection,
-    )
+    await manager.broadcast_to_collection(update_msg, collection)
 
     client_count = len(manager.subscriptions.get(collection, set()))
     return {"clients_notified": client_count}
@@ -3,6 +3,7 @@ Claude Code Memory Explorer - FastAPI Backend
 Main application entry point with CORS configuration and route registration.
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -10,13 +11,14 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from api.collections import router as collections_router
 from api.entities import router as entities_router
-from api.search import router as search_router
+from api.search import router as search_router, embedder, get_embedding_cache_stats
 from api.graph import router as graph_router
-from api.websocket import router as websocket_router
+from api.websocket import router as websocket_router, ping_loop
+from config import get_settings
 
 
 @asynccontextmanager
@@ -27,8 +29,11 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("🚀 Claude Code Memory Explorer API starting...")
+    ping_task = asyncio.create_task(ping_loop())
     yield
     # Shutdown
+    ping_task.cancel()
+    await embedder.close()
     print("👋 Claude Code Memory Explorer API shutting down...")
 
 
@@ -38,6 +43,7 @@ app = FastAPI(
     description="Interactive web API for exploring and querying indexed codebases",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS for local development
@@ -59,11 +65,12 @@ app.add_middleware(
 @app.get("/health")
 async def health_check():
     """Check if the API is running and healthy."""
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "status": "healthy",
             "service": "Claude Code Memory Explorer API",
             "version": "1.0.0",
+            "embedding_cache": get_embedding_cache_stats(),
         }
     )
 
@@ -92,7 +99,7 @@ app.include_router(websocket_router, prefix="/ws", tags=["WebSocket"])
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Handle unexpected exceptions gracefully."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -105,10 +112,14 @@ async def global_exception_handler(request, exc):
 if __name__ == "__main__":
     import uvicorn
 
+    settings = get_settings()
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        # The file watcher is only useful while developing
+        reload=settings.debug and settings.reload,
+        loop="uvloop",
+        http="httptools",
         log_level="info",
     )
\ No newline at end of file
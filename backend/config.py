@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,6 +16,12 @@ load_dotenv()
 # Load settings.txt from backend directory for API keys
 SETTINGS_FILE = Path(__file__).parent / "settings.txt"
 
+# settings.txt key -> Settings attribute
+SETTINGS_FILE_KEYS = {
+    "QDRANT_URL": "qdrant_url",
+    "QDRANT_API_KEY": "qdrant_api_key",
+}
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -30,19 +36,44 @@ class Settings(BaseSettings):
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: Optional[str] = None
     qdrant_timeout: int = 30
+    qdrant_prefer_grpc: bool = False  # gRPC over HTTP/2; needs the gRPC port published
+    qdrant_grpc_port: int = 6334
 
     # Search Configuration
     default_search_limit: int = 20
     max_search_limit: int = 100
     search_mode_default: str = "hybrid"  # semantic, keyword, hybrid
+    search_hnsw_ef: Optional[int] = None  # HNSW beam width, None for the collection default
+    hybrid_prefetch_limit: int = 500  # candidates per list fed to fusion, bounds hybrid paging
 
     # Token Limits (for MCP compliance)
     max_response_tokens: int = 23000  # 92% of 25k MCP limit
     token_estimate_ratio: float = 0.25  # 1 token per 4 chars
 
+    # Quantization Configuration
+    quantization_oversampling: float = 2.0  # candidates rescored per result
+
+    # Sparse (BM25) Search Configuration
+    sparse_vector_name: str = "sparse"  # named sparse vector in collections
+    sparse_model_name: str = "Qdrant/bm25"  # fastembed model, if installed
+
+    # Embedding Batching Configuration
+    embedding_batch_size: int = 32  # max queries per provider call
+    embedding_batch_wait_ms: float = 5.0  # max time a query waits for a batch
+
+    # Response Cache Configuration
+    response_cache_ttl: int = 60  # seconds
+    response_cache_maxsize: int = 512  # cached responses across all collections
+
+    # Semantic Search Cache Configuration
+    semantic_cache_size: int = 256  # cached query embeddings
+    semantic_cache_threshold: float = 0.95  # minimum cosine similarity for a hit
+    semantic_cache_ttl: int = 60  # seconds
+
     # WebSocket Configuration
     ws_ping_interval: int = 30
-    ws_max_connections: int = 100
+    ws_max_connections: int = 100  # 0 or less for no limit
+    ws_max_subscribers_per_collection: int = 50  # 0 or less for no limit
 
     # Development Settings
     debug: bool = False
@@ -58,21 +89,14 @@ class Settings(BaseSettings):
 
     def _load_settings_file(self):
         """Load API keys from settings.txt if it exists."""
-        if SETTINGS_FILE.exists():
-            with open(SETTINGS_FILE, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        if "=" in line:
-                            key, value = line.split("=", 1)
-                            key = key.strip()
-                            value = value.strip()
-
-                            # Map settings.txt keys to our config
-                            if key == "QDRANT_URL":
-                                self.qdrant_url = value
-                            elif key == "QDRANT_API_KEY":
-                                self.qdrant_api_key = value if value != "None" else None
+        if not SETTINGS_FILE.exists():
+            return
+
+        for key, value in dotenv_values(SETTINGS_FILE).items():
+            # Map settings.txt keys to our config, skipping unrelated keys
+            attr = SETTINGS_FILE_KEYS.get(key)
+            if attr and value is not None:
+                setattr(self, attr, value if value != "None" else None)
 
 
 # Create global settings instance
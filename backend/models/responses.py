@@ -0,0 +1,19 @@
+"""
+Response classes for returning schema models without re-validation.
+"""
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """
+    JSON response rendered directly from a pydantic model.
+    Returning it skips FastAPI's response_model re-validation and
+    jsonable_encoder pass, which otherwise walk large result lists twice.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode("utf-8")
@@ -2,6 +2,7 @@
 Pydantic schemas for API request/response models.
 """
 
+import time
 from typing import Any, Dict, List, Optional, Literal
 from datetime import datetime
 from enum import Enum
@@ -118,6 +119,13 @@ class Entity(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class EntityPage(BaseModel):
+    """A page of entities with a cursor for the next page."""
+
+    entities: List[Entity]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
 class Relation(BaseModel):
     """Relation between entities."""
 
@@ -143,7 +151,8 @@ class SearchResponse(BaseModel):
     """Response for search operations."""
 
     results: List[SearchResult]
-    total: int
+    total: int = Field(..., description="Results up to and including this page")
+    has_more: bool = Field(False, description="Whether another page is available")
     query: str
     mode: SearchMode
     took_ms: float
@@ -202,4 +211,11 @@ class WSMessage(BaseModel):
     type: Literal["ping", "pong", "update", "error", "subscribe", "unsubscribe"]
     collection: Optional[str] = None
     data: Optional[Dict[str, Any]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    timestamp: int = Field(default_factory=time.time_ns, description="Nanoseconds since epoch")
+
+
+class WSClientMessage(BaseModel):
+    """Message sent by a WebSocket client."""
+
+    type: Optional[str] = None
+    collection: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Micro-batching for query embeddings.
+Coalesces embedding requests that arrive close together into a single
+provider call, so concurrent searches share one round-trip.
+"""
+
+import asyncio
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import get_settings
+
+# Takes a batch of texts and returns one embedding per text, in order
+EmbedBatchFn = Callable[[List[str]], Sequence[np.ndarray]]
+
+
+class EmbeddingBatcher:
+    """
+    Queue-backed embedding batcher.
+    A background task drains the queue when the batch is full or the
+    oldest request has waited max_wait_ms, calls the provider once, and
+    resolves each caller's future with its embedding. A request that
+    arrives alone is flushed right away.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        max_batch_size: int,
+        max_wait_ms: float,
+        run_in_thread: bool = True,
+    ):
+        self._embed_batch = embed_batch
+        self._run_in_thread = run_in_thread
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> None:
+        """Start the batching task on the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a single text as part of the next batch.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Embedding vector.
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the batching task."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """
+        Wait for one request, then collect more until full or timed out.
+        If nothing else is queued after one pass of the event loop, the
+        request is sent on its own without waiting.
+        """
+        batch = [await self._queue.get()]
+
+        # Let requests scheduled in the same loop iteration enqueue
+        await asyncio.sleep(0)
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if len(batch) == 1:
+            return batch
+
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            texts = [text for text, _ in batch]
+
+            try:
+                if self._run_in_thread:
+                    embeddings = await asyncio.to_thread(self._embed_batch, texts)
+                else:
+                    embeddings = self._embed_batch(texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+def create_embedding_batcher(
+    embed_batch: EmbedBatchFn, run_in_thread: bool = True
+) -> EmbeddingBatcher:
+    """
+    Create a batcher configured from settings.
+
+    Args:
+        embed_batch: Provider call embedding a batch of texts.
+        run_in_thread: Run the provider in a worker thread; disable for
+            providers that return without blocking.
+
+    Returns:
+        Embedding batcher.
+    """
+    settings = get_settings()
+    return EmbeddingBatcher(
+        embed_batch,
+        max_batch_size=settings.embedding_batch_size,
+        max_wait_ms=settings.embedding_batch_wait_ms,
+        run_in_thread=run_in_thread,
+    )
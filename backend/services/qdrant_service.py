@@ -3,26 +3,60 @@ Qdrant service wrapper for database operations.
 Provides high-level interface to Qdrant vector database.
 """
 
+import asyncio
 import hashlib
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
+from cachetools import TTLCache
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
     Filter,
     FieldCondition,
+    Fusion,
+    FusionQuery,
+    MatchAny,
     MatchValue,
     PointStruct,
+    Prefetch,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
     VectorParams,
     SearchParams,
     SparseVector,
     NamedVector,
+    Record,
     ScoredPoint,
 )
 
 from config import get_settings
-from models.schemas import Entity, Relation, EntityType, SearchMode, ChunkType
+from models.schemas import Entity, Relation, EntityType, RelationType, SearchMode, ChunkType
+
+# Payload value -> enum member, so conversion is a dict lookup
+ENTITY_TYPES = {t.value: t for t in EntityType}
+RELATION_TYPES = {t.value: t for t in RelationType}
+
+# Filter conditions shared by most queries, built once
+IS_CHUNK = FieldCondition(key="type", match=MatchValue(value="chunk"))
+METADATA_CHUNK = FieldCondition(key="chunk_type", match=MatchValue(value="metadata"))
+IMPLEMENTATION_CHUNK = FieldCondition(key="chunk_type", match=MatchValue(value="implementation"))
+RELATION_CHUNK = FieldCondition(key="chunk_type", match=MatchValue(value="relation"))
+ENTITY_FILTER = Filter(must=[IS_CHUNK, METADATA_CHUNK])
+RELATION_FILTER = Filter(must=[RELATION_CHUNK])
+
+# Payload keys read by the point converters; vectors are never fetched
+ENTITY_PAYLOAD = ["entity_name", "metadata"]
+RELATION_PAYLOAD = ["metadata"]
+IMPLEMENTATION_PAYLOAD = ["content"]
+
+# Points per scroll request when loading a whole collection into memory
+FULL_LOAD_PAGE_SIZE = 1000
 
 
 class QdrantService:
@@ -38,9 +72,57 @@ class QdrantService:
             url=settings.qdrant_url,
             api_key=settings.qdrant_api_key,
             timeout=settings.qdrant_timeout,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port,
         )
         self.settings = settings
 
+        # Dense searches use the configured HNSW beam width, and over quantized
+        # vectors oversample and rescore the candidates with full precision
+        # vectors; collections without quantization ignore the latter
+        self._dense_search_params = SearchParams(
+            hnsw_ef=settings.search_hnsw_ef,
+            quantization=QuantizationSearchParams(
+                rescore=True,
+                oversampling=settings.quantization_oversampling,
+            )
+        )
+
+        # Entity lookups: (collection, entity_name) -> Entity
+        self._entity_cache: TTLCache = TTLCache(maxsize=4096, ttl=300)
+        # Full relation loads are expensive and only change on reindex, which
+        # calls invalidate_collection, so they are kept for an hour
+        # All relations of a collection: (collection,) -> relations
+        self._relations_cache: TTLCache = TTLCache(maxsize=64, ttl=3600)
+        # Adjacency indexes: (collection,) -> entity name -> relations touching it
+        self._adjacency_cache: TTLCache = TTLCache(maxsize=64, ttl=3600)
+        # Per-collection locks so concurrent misses share one full load
+        self._load_locks: Dict[str, threading.RLock] = {}
+        # Collection metadata: collection name -> info dict, and the name list
+        self._info_cache: TTLCache = TTLCache(maxsize=256, ttl=10)
+        self._collections_cache: TTLCache = TTLCache(maxsize=1, ttl=10)
+        # Name indexes for prefix lookups: collection name -> (keys, entities)
+        self._name_index_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+        # Service methods run in worker threads, so guard cache access
+        self._cache_lock = threading.Lock()
+        # Runs independent Qdrant calls of a single method in parallel
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="qdrant")
+
+    def invalidate_collection(self, collection: str) -> None:
+        """
+        Drop cached data for a collection after it is reindexed or deleted.
+
+        Args:
+            collection: Collection name.
+        """
+        with self._cache_lock:
+            for cache in (self._entity_cache, self._relations_cache, self._adjacency_cache):
+                for key in [k for k in list(cache.keys()) if k[0] == collection]:
+                    cache.pop(key, None)
+            self._info_cache.pop(collection, None)
+            self._name_index_cache.pop(collection, None)
+            self._collections_cache.clear()
+
     def list_collections(self) -> List[str]:
         """
         List all available collections in Qdrant.
@@ -51,6 +133,21 @@ class QdrantService:
         collections = self.client.get_collections()
         return [col.name for col in collections.collections]
 
+    def list_collections_cached(self) -> List[str]:
+        """
+        List all available collections, serving repeat calls from memory.
+
+        Returns:
+            List of collection names.
+        """
+        with self._cache_lock:
+            names = self._collections_cache.get("names")
+        if names is None:
+            names = self.list_collections()
+            with self._cache_lock:
+                self._collections_cache["names"] = names
+        return list(names)
+
     def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
         """
         Get detailed information about a collection.
@@ -62,36 +159,22 @@ class QdrantService:
             Dictionary with collection statistics.
         """
         try:
-            info = self.client.get_collection(collection_name)
-
-            # Count entities and relations
-            entity_count = self.client.count(
+            # Fetch the collection and count entities and relations in parallel
+            info_future = self._executor.submit(self.client.get_collection, collection_name)
+            entity_future = self._executor.submit(
+                self.client.count,
                 collection_name=collection_name,
-                count_filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key="type",
-                            match=MatchValue(value="chunk"),
-                        ),
-                        FieldCondition(
-                            key="chunk_type",
-                            match=MatchValue(value="metadata"),
-                        ),
-                    ]
-                ),
-            ).count
-
-            relation_count = self.client.count(
+                count_filter=ENTITY_FILTER,
+            )
+            relation_future = self._executor.submit(
+                self.client.count,
                 collection_name=collection_name,
-                count_filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key="chunk_type",
-                            match=MatchValue(value="relation"),
-                        ),
-                    ]
-                ),
-            ).count
+                count_filter=RELATION_FILTER,
+            )
+
+            info = info_future.result()
+            entity_count = entity_future.result().count
+            relation_count = relation_future.result().count
 
             return {
                 "name": collection_name,
@@ -108,6 +191,8 @@ class QdrantService:
                     "distance": info.config.params.vectors.get("dense", {}).distance
                     if isinstance(info.config.params.vectors, dict)
                     else None,
+                    "sparse_vectors": list(info.config.params.sparse_vectors or {}),
+                    "quantized": info.config.quantization_config is not None,
                 },
             }
         except Exception as e:
@@ -117,79 +202,172 @@ class QdrantService:
                 "status": "error",
             }
 
+    def get_collection_info_cached(self, collection_name: str) -> Dict[str, Any]:
+        """
+        Get collection information, serving repeat calls from memory.
+        Error results are not cached so a missing collection is re-checked.
+
+        Args:
+            collection_name: Name of the collection.
+
+        Returns:
+            Dictionary with collection statistics.
+        """
+        with self._cache_lock:
+            info = self._info_cache.get(collection_name)
+        if info is None:
+            info = self.get_collection_info(collection_name)
+            if not info.get("error"):
+                with self._cache_lock:
+                    self._info_cache[collection_name] = info
+        return info
+
+    def enable_quantization(self, collection: str) -> None:
+        """
+        Quantize a collection's dense vectors to int8.
+        Qdrant builds the quantized vectors in the background, keeping the
+        originals on disk for rescoring.
+
+        Args:
+            collection: Collection name.
+        """
+        self.client.update_collection(
+            collection_name=collection,
+            quantization_config=ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                )
+            ),
+        )
+
+    def has_sparse_vectors(self, collection: str) -> bool:
+        """
+        Check whether a collection has the sparse vector used for keyword search.
+
+        Args:
+            collection: Collection name.
+
+        Returns:
+            True if the configured sparse vector exists in the collection.
+        """
+        info = self.get_collection_info_cached(collection)
+        sparse_vectors = info.get("config", {}).get("sparse_vectors", [])
+        return self.settings.sparse_vector_name in sparse_vectors
+
     async def search_similar(
         self,
         collection: str,
-        query_vector: List[float],
+        query_vector: Union[np.ndarray, List[float]],
         mode: SearchMode = SearchMode.HYBRID,
         entity_types: Optional[List[EntityType]] = None,
         limit: int = 20,
         include_implementation: bool = False,
+        offset: int = 0,
+        sparse_vector: Optional[SparseVector] = None,
     ) -> List[Tuple[Entity, float]]:
         """
         Search for similar entities using semantic, keyword, or hybrid search.
 
         Args:
             collection: Collection to search in.
-            query_vector: Query embedding vector.
+            query_vector: Query embedding vector (float32 array or list).
             mode: Search mode (semantic, keyword, hybrid).
             entity_types: Filter by entity types.
             limit: Maximum results to return.
             include_implementation: Include implementation chunks.
+            offset: Number of top-ranked results to skip.
+            sparse_vector: BM25 query vector for keyword and hybrid modes.
 
         Returns:
             List of (Entity, score) tuples.
         """
+        # The client's vector models take plain lists, so convert once here
+        if isinstance(query_vector, np.ndarray):
+            query_vector = query_vector.tolist()
+
         # Build filter
-        must_conditions = [
-            FieldCondition(key="type", match=MatchValue(value="chunk")),
-        ]
+        must_conditions = [IS_CHUNK]
 
         if not include_implementation:
-            must_conditions.append(
-                FieldCondition(key="chunk_type", match=MatchValue(value="metadata"))
-            )
+            must_conditions.append(METADATA_CHUNK)
 
         if entity_types:
             must_conditions.append(
                 FieldCondition(
                     key="metadata.entity_type",
-                    match=MatchValue(
-                        any=[et.value for et in entity_types]
-                    ),
+                    match=MatchAny(any=[et.value for et in entity_types]),
                 )
             )
 
         filter_query = Filter(must=must_conditions)
 
+        # Keyword and hybrid modes need a sparse query and a sparse index;
+        # without them they fall back to dense search
+        use_sparse = (
+            mode != SearchMode.SEMANTIC
+            and sparse_vector is not None
+            and await asyncio.to_thread(self.has_sparse_vectors, collection)
+        )
+
         # Perform search based on mode
-        if mode == SearchMode.SEMANTIC:
-            results = self.client.search(
+        if not use_sparse:
+            results = await asyncio.to_thread(
+                self.client.search,
                 collection_name=collection,
                 query_vector=NamedVector(name="dense", vector=query_vector),
                 query_filter=filter_query,
+                search_params=self._dense_search_params,
                 limit=limit,
+                offset=offset,
+                with_payload=ENTITY_PAYLOAD,
+                with_vectors=False,
             )
         elif mode == SearchMode.KEYWORD:
-            # For keyword search, we would need BM25 sparse vectors
-            # This is a simplified version - real implementation would use sparse vectors
-            results = self.client.search(
+            response = await asyncio.to_thread(
+                self.client.query_points,
                 collection_name=collection,
-                query_vector=NamedVector(name="dense", vector=query_vector),
+                query=sparse_vector,
+                using=self.settings.sparse_vector_name,
                 query_filter=filter_query,
                 limit=limit,
+                offset=offset,
+                with_payload=ENTITY_PAYLOAD,
+                with_vectors=False,
             )
+            results = response.points
         else:  # HYBRID
-            # Perform both searches and merge results
-            semantic_results = self.client.search(
+            # Fuse dense and sparse candidate lists with reciprocal rank fusion.
+            # The candidate pools do not depend on the page, so every page
+            # slices the same fused ranking
+            candidates = self.settings.hybrid_prefetch_limit
+            response = await asyncio.to_thread(
+                self.client.query_points,
                 collection_name=collection,
-                query_vector=NamedVector(name="dense", vector=query_vector),
+                prefetch=[
+                    Prefetch(
+                        query=query_vector,
+                        using="dense",
+                        filter=filter_query,
+                        params=self._dense_search_params,
+                        limit=candidates,
+                    ),
+                    Prefetch(
+                        query=sparse_vector,
+                        using=self.settings.sparse_vector_name,
+                        filter=filter_query,
+                        limit=candidates,
+                    ),
+                ],
+                query=FusionQuery(fusion=Fusion.RRF),
                 query_filter=filter_query,
-                limit=limit * 2,  # Get more for merging
+                limit=limit,
+                offset=offset,
+                with_payload=ENTITY_PAYLOAD,
+                with_vectors=False,
             )
-
-            # Simplified hybrid - in production, merge with BM25 results
-            results = semantic_results[:limit]
+            results = response.points
 
         # Convert results to entities
         entities = []
@@ -200,6 +378,67 @@ class QdrantService:
 
         return entities
 
+    def list_entities(
+        self,
+        collection: str,
+        entity_types: Optional[List[EntityType]] = None,
+        limit: int = 50,
+        page_offset: Optional[Union[int, str]] = None,
+    ) -> Tuple[List[Entity], Optional[Union[int, str]]]:
+        """
+        List one page of entities using Qdrant's scroll cursor.
+
+        Args:
+            collection: Collection name.
+            entity_types: Optional entity type filters.
+            limit: Maximum entities in the page.
+            page_offset: Point ID to resume from, as returned for the previous page.
+
+        Returns:
+            Tuple of (entities, next page offset or None on the last page).
+        """
+        results, next_page_offset = self.client.scroll(
+            collection_name=collection,
+            scroll_filter=self._entity_filter(entity_types),
+            limit=limit,
+            offset=page_offset,
+            with_payload=ENTITY_PAYLOAD,
+            with_vectors=False,
+        )
+
+        entities = []
+        for point in results:
+            entity = self._point_to_entity(point)
+            if entity:
+                entities.append(entity)
+
+        return entities, next_page_offset
+
+    def get_entity_name_index(self, collection: str) -> Tuple[List[str], List[Entity]]:
+        """
+        Get every entity in a collection sorted by lowercased name.
+        Built with a full scroll on first use, then served from memory.
+
+        Args:
+            collection: Collection name.
+
+        Returns:
+            Tuple of (sorted lowercased names, entities in the same order).
+        """
+        with self._cache_lock:
+            index = self._name_index_cache.get(collection)
+        if index is not None:
+            return index
+
+        entities = list(
+            self._iter_entities(collection, ENTITY_FILTER, FULL_LOAD_PAGE_SIZE)
+        )
+        entities.sort(key=lambda e: e.name.lower())
+        index = ([e.name.lower() for e in entities], entities)
+        with self._cache_lock:
+            self._name_index_cache[collection] = index
+        return index
+
     def get_entity(self, collection: str, entity_name: str) -> Optional[Entity]:
         """
         Get a specific entity by name.
@@ -214,8 +453,8 @@ class QdrantService:
         # Search for entity by name
         filter_query = Filter(
             must=[
-                FieldCondition(key="type", match=MatchValue(value="chunk")),
-                FieldCondition(key="chunk_type", match=MatchValue(value="metadata")),
+                IS_CHUNK,
+                METADATA_CHUNK,
                 FieldCondition(key="entity_name", match=MatchValue(value=entity_name)),
             ]
         )
@@ -224,12 +463,87 @@ class QdrantService:
             collection_name=collection,
             scroll_filter=filter_query,
             limit=1,
+            with_payload=ENTITY_PAYLOAD,
+            with_vectors=False,
         )[0]
 
         if results:
             return self._point_to_entity(results[0])
         return None
 
+    def get_entities_bulk(
+        self, collection: str, entity_names: List[str]
+    ) -> Dict[str, Entity]:
+        """
+        Get several entities by name in a single round-trip.
+
+        Args:
+            collection: Collection name.
+            entity_names: Entity names to look up.
+
+        Returns:
+            Dictionary mapping entity name to Entity for the names found.
+        """
+        entities = {}
+        missing = []
+        with self._cache_lock:
+            for name in dict.fromkeys(entity_names):
+                entity = self._entity_cache.get((collection, name))
+                if entity:
+                    entities[name] = entity
+                else:
+                    missing.append(name)
+
+        if not missing:
+            return entities
+
+        filter_query = Filter(
+            must=[
+                IS_CHUNK,
+                METADATA_CHUNK,
+                FieldCondition(key="entity_name", match=MatchAny(any=missing)),
+            ]
+        )
+
+        # Several points can share a name, so keep paging until every name
+        # is resolved or the matches run out
+        fetched = {}
+        for entity in self._iter_entities(
+            collection, filter_query, page_size=min(len(missing), 256)
+        ):
+            fetched.setdefault(entity.name, entity)
+            if len(fetched) == len(missing):
+                break
+
+        with self._cache_lock:
+            for name, entity in fetched.items():
+                self._entity_cache[(collection, name)] = entity
+
+        entities.update(fetched)
+        return entities
+
+    def get_entity_cached(self, collection: str, entity_name: str) -> Optional[Entity]:
+        """
+        Get a specific entity by name, serving repeat lookups from memory.
+
+        Args:
+            collection: Collection name.
+            entity_name: Entity name.
+
+        Returns:
+            Entity object or None if not found.
+        """
+        with self._cache_lock:
+            entity = self._entity_cache.get((collection, entity_name))
+        if entity:
+            return entity
+
+        entity = self.get_entity(collection, entity_name)
+        if entity:
+            with self._cache_lock:
+                self._entity_cache[(collection, entity_name)] = entity
+        return entity
+
     def get_implementation(
         self, collection: str, entity_name: str
     ) -> Optional[str]:
@@ -245,10 +559,8 @@ class QdrantService:
         """
         filter_query = Filter(
             must=[
-                FieldCondition(key="type", match=MatchValue(value="chunk")),
-                FieldCondition(
-                    key="chunk_type", match=MatchValue(value="implementation")
-                ),
+                IS_CHUNK,
+                IMPLEMENTATION_CHUNK,
                 FieldCondition(key="entity_name", match=MatchValue(value=entity_name)),
             ]
         )
@@ -257,6 +569,8 @@ class QdrantService:
             collection_name=collection,
             scroll_filter=filter_query,
             limit=1,
+            with_payload=IMPLEMENTATION_PAYLOAD,
+            with_vectors=False,
         )[0]
 
         if results:
@@ -269,6 +583,7 @@ class QdrantService:
     ) -> List[Relation]:
         """
         Get relations, optionally filtered by entity.
+        Relations are loaded once per collection and served from memory.
 
         Args:
             collection: Collection name.
@@ -277,39 +592,63 @@ class QdrantService:
         Returns:
             List of relations.
         """
-        must_conditions = [
-            FieldCondition(key="chunk_type", match=MatchValue(value="relation")),
-        ]
-
         if entity_name:
-            # Get relations where entity is involved
-            should_conditions = [
-                FieldCondition(
-                    key="metadata.from_entity",
-                    match=MatchValue(value=entity_name),
-                ),
-                FieldCondition(
-                    key="metadata.to_entity",
-                    match=MatchValue(value=entity_name),
-                ),
-            ]
-            filter_query = Filter(must=must_conditions, should=should_conditions)
-        else:
-            filter_query = Filter(must=must_conditions)
+            # Relations where the entity is the source or the target
+            return list(self.get_relations_index(collection).get(entity_name, ()))
+
+        cache_key = (collection,)
+        with self._cache_lock:
+            cached = self._relations_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        with self._load_lock(collection):
+            with self._cache_lock:
+                relations = self._relations_cache.get(cache_key)
+            if relations is None:
+                # Page through every relation in the collection
+                relations = list(
+                    self._iter_relations(collection, RELATION_FILTER, FULL_LOAD_PAGE_SIZE)
+                )
+                with self._cache_lock:
+                    self._relations_cache[cache_key] = relations
 
-        results, _ = self.client.scroll(
-            collection_name=collection,
-            scroll_filter=filter_query,
-            limit=1000,  # Get all relations
-        )
+        return list(relations)
 
-        relations = []
-        for point in results:
-            relation = self._point_to_relation(point)
-            if relation:
-                relations.append(relation)
+    def get_relations_index(self, collection: str) -> Dict[str, List[Relation]]:
+        """
+        Get all relations of a collection indexed by the entities they touch.
 
-        return relations
+        Args:
+            collection: Collection name.
+
+        Returns:
+            Dictionary mapping entity name to its incoming and outgoing relations.
+        """
+        cache_key = (collection,)
+        with self._cache_lock:
+            adjacency = self._adjacency_cache.get(cache_key)
+        if adjacency is not None:
+            return adjacency
+
+        with self._load_lock(collection):
+            with self._cache_lock:
+                adjacency = self._adjacency_cache.get(cache_key)
+            if adjacency is None:
+                adjacency = {}
+                for relation in self.get_relations(collection):
+                    adjacency.setdefault(relation.from_entity, []).append(relation)
+                    if relation.to_entity != relation.from_entity:
+                        adjacency.setdefault(relation.to_entity, []).append(relation)
+                with self._cache_lock:
+                    self._adjacency_cache[cache_key] = adjacency
+
+        return adjacency
+
+    def _load_lock(self, collection: str) -> threading.RLock:
+        """Get the lock serializing full loads of a collection."""
+        with self._cache_lock:
+            return self._load_locks.setdefault(collection, threading.RLock())
 
     def get_graph_data(
         self,
@@ -333,116 +672,175 @@ class QdrantService:
             Tuple of (entities, relations).
         """
         if entity:
-            # Start from specific entity and traverse
-            entities = set()
-            relations = []
-            to_visit = {entity}
-            visited = set()
-            current_depth = 0
-
-            while to_visit and current_depth < depth and len(entities) < limit:
-                current_entity = to_visit.pop()
-                if current_entity in visited:
+            # Traverse an in-memory relations index instead of querying per node
+            adjacency = self.get_relations_index(collection)
+
+            # Level-order walk from the entity, so a limited budget is
+            # filled with the nearest nodes first
+            names = {entity: None}
+            relations = {}
+            queue = deque([(entity, 0)])
+
+            while queue and len(names) < limit:
+                name, node_depth = queue.popleft()
+                if node_depth == depth:
                     continue
 
-                visited.add(current_entity)
-
-                # Get the entity
-                entity_obj = self.get_entity(collection, current_entity)
-                if entity_obj:
-                    entities.add(entity_obj.name)
-
-                # Get related entities
-                entity_relations = self.get_relations(collection, current_entity)
-                for rel in entity_relations:
-                    relations.append(rel)
-                    # Add connected entities to visit
-                    if rel.from_entity == current_entity:
-                        to_visit.add(rel.to_entity)
-                    else:
-                        to_visit.add(rel.from_entity)
-
-                current_depth += 1
-
-            # Get entity objects for all names
-            entity_objects = []
-            for entity_name in entities:
-                entity_obj = self.get_entity(collection, entity_name)
-                if entity_obj:
-                    entity_objects.append(entity_obj)
-
-            return entity_objects, relations
+                for rel in adjacency.get(name, ()):
+                    relations.setdefault(rel.id, rel)
+                    other = rel.to_entity if rel.from_entity == name else rel.from_entity
+                    if other not in names:
+                        names[other] = None
+                        if len(names) >= limit:
+                            break
+                        queue.append((other, node_depth + 1))
+
+            # Resolve all visited names in one lookup
+            found = self.get_entities_bulk(collection, list(names))
+            entity_objects = [found[name] for name in names if name in found]
+
+            return entity_objects, list(relations.values())
         else:
-            # Get all entities and relations with filters
-            must_conditions = [
-                FieldCondition(key="type", match=MatchValue(value="chunk")),
-                FieldCondition(key="chunk_type", match=MatchValue(value="metadata")),
-            ]
+            # Stream entities until the node budget is reached
+            entities = []
+            for entity_obj in self._iter_entities(
+                collection, self._entity_filter(entity_types), page_size=min(limit, 256)
+            ):
+                entities.append(entity_obj)
+                if len(entities) >= limit:
+                    break
+
+            # Get relations; callers keep the edges between returned entities
+            # but size nodes by their degree over the whole graph
+            relations = self.get_relations(collection)
 
-            if entity_types:
-                must_conditions.append(
-                    FieldCondition(
-                        key="metadata.entity_type",
-                        match=MatchValue(any=[et.value for et in entity_types]),
-                    )
-                )
+            return entities, relations
 
-            filter_query = Filter(must=must_conditions)
+    def _scroll_points(
+        self,
+        collection: str,
+        scroll_filter: Filter,
+        payload_keys: List[str],
+        page_size: int = 256,
+    ) -> Iterator[Record]:
+        """
+        Lazily page through every point matching a filter.
 
-            # Get entities
-            entity_results, _ = self.client.scroll(
+        Args:
+            collection: Collection name.
+            scroll_filter: Filter to scroll with.
+            payload_keys: Payload keys to fetch; vectors are never fetched.
+            page_size: Points fetched per scroll request.
+
+        Yields:
+            Matching points, one page fetched at a time.
+        """
+        page_offset = None
+        while True:
+            results, page_offset = self.client.scroll(
                 collection_name=collection,
-                scroll_filter=filter_query,
-                limit=limit,
+                scroll_filter=scroll_filter,
+                limit=page_size,
+                offset=page_offset,
+                with_payload=payload_keys,
+                with_vectors=False,
             )
+            yield from results
+            if page_offset is None:
+                return
+
+    def _iter_entities(
+        self, collection: str, filter_query: Filter, page_size: int = 256
+    ) -> Iterator[Entity]:
+        """Lazily yield the entities matching a filter."""
+        for point in self._scroll_points(
+            collection, filter_query, ENTITY_PAYLOAD, page_size
+        ):
+            entity = self._point_to_entity(point)
+            if entity:
+                yield entity
+
+    def _iter_relations(
+        self, collection: str, filter_query: Filter, page_size: int = 256
+    ) -> Iterator[Relation]:
+        """Lazily yield the relations matching a filter."""
+        for point in self._scroll_points(
+            collection, filter_query, RELATION_PAYLOAD, page_size
+        ):
+            relation = self._point_to_relation(point)
+            if relation:
+                yield relation
 
-            entities = []
-            for point in entity_results:
-                entity_obj = self._point_to_entity(point)
-                if entity_obj:
-                    entities.append(entity_obj)
-
-            # Get relations
-            relations = self.get_relations(collection)
+    @staticmethod
+    def _entity_filter(entity_types: Optional[List[EntityType]] = None) -> Filter:
+        """Build the filter matching entity metadata chunks, optionally by type."""
+        if not entity_types:
+            return ENTITY_FILTER
 
-            return entities, relations
+        return Filter(
+            must=[
+                IS_CHUNK,
+                METADATA_CHUNK,
+                FieldCondition(
+                    key="metadata.entity_type",
+                    match=MatchAny(any=[et.value for et in entity_types]),
+                ),
+            ]
+        )
 
-    def _point_to_entity(self, point: Any) -> Optional[Entity]:
-        """Convert a Qdrant point to an Entity object."""
+    def _point_to_entity(self, point: Union[ScoredPoint, Record]) -> Optional[Entity]:
+        """
+        Convert a Qdrant point to an Entity object.
+        Payloads are written by our own indexer, so field validation is skipped.
+        """
         try:
             payload = point.payload
             metadata = payload.get("metadata", {})
+            # Bind the lookup once for the fixed set of metadata fields
+            get = metadata.get
+
+            entity_type = ENTITY_TYPES.get(get("entity_type", "function"))
+            if entity_type is None:
+                raise ValueError(f"Unknown entity type: {get('entity_type')}")
 
-            return Entity(
+            return Entity.model_construct(
                 id=str(point.id),
                 name=payload.get("entity_name", ""),
-                entity_type=EntityType(metadata.get("entity_type", "function")),
-                observations=metadata.get("observations", []),
-                file_path=metadata.get("file_path"),
-                line_number=metadata.get("line_number"),
-                end_line_number=metadata.get("end_line_number"),
-                docstring=metadata.get("docstring"),
-                signature=metadata.get("signature"),
-                complexity_score=metadata.get("complexity_score"),
+                entity_type=entity_type,
+                observations=get("observations") or [],
+                file_path=get("file_path"),
+                line_number=get("line_number"),
+                end_line_number=get("end_line_number"),
+                docstring=get("docstring"),
+                signature=get("signature"),
+                complexity_score=get("complexity_score"),
                 metadata=metadata,
             )
         except Exception as e:
             print(f"Error converting point to entity: {e}")
             return None
 
-    def _point_to_relation(self, point: Any) -> Optional[Relation]:
-        """Convert a Qdrant point to a Relation object."""
+    def _point_to_relation(self, point: Union[ScoredPoint, Record]) -> Optional[Relation]:
+        """
+        Convert a Qdrant point to a Relation object.
+        Payloads are written by our own indexer, so field validation is skipped.
+        """
         try:
             payload = point.payload
             metadata = payload.get("metadata", {})
+            get = metadata.get
+
+            relation_type = RELATION_TYPES.get(get("relation_type", "uses"))
+            if relation_type is None:
+                raise ValueError(f"Unknown relation type: {get('relation_type')}")
 
-            return Relation(
+            return Relation.model_construct(
                 id=str(point.id),
-                from_entity=metadata.get("from_entity", ""),
-                to_entity=metadata.get("to_entity", ""),
-                relation_type=metadata.get("relation_type", "uses"),
-                context=metadata.get("context"),
-                confidence=metadata.get("confidence", 1.0),
+                from_entity=get("from_entity", ""),
+                to_entity=get("to_entity", ""),
+                relation_type=relation_type,
+                context=get("context"),
+                confidence=get("confidence", 1.0),
                 metadata=metadata,
             )
         except Exception as e:
@@ -452,9 +850,10 @@ class QdrantService:
     @staticmethod
     def generate_id(content: str) -> int:
         """Generate a deterministic ID from content."""
-        hash_obj = hashlib.sha256(content.encode())
-        # Take first 8 bytes and convert to int
-        return int.from_bytes(hash_obj.digest()[:8], "big") % (2**63)
+        # IDs only need to be stable and well spread, so ask blake2b for
+        # exactly the 8 bytes we keep rather than truncating a SHA-256 digest
+        hash_obj = hashlib.blake2b(content.encode(), digest_size=8)
+        return int.from_bytes(hash_obj.digest(), "big") % (2**63)
 
 
 # Global service instance
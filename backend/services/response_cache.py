@@ -0,0 +1,56 @@
+"""
+In-process response cache for expensive read endpoints.
+Entries are keyed by collection so they can be dropped when it changes.
+"""
+
+from typing import Any, Hashable, Optional
+
+from cachetools import TTLCache
+
+from config import get_settings
+
+_settings = get_settings()
+
+# (collection, key) -> cached response
+_response_cache: TTLCache = TTLCache(
+    maxsize=_settings.response_cache_maxsize,
+    ttl=_settings.response_cache_ttl,
+)
+
+
+def get_cached_response(collection: str, key: Hashable) -> Optional[Any]:
+    """
+    Get a cached response for a collection.
+
+    Args:
+        collection: Collection name.
+        key: Endpoint-specific key (endpoint name and query params).
+
+    Returns:
+        Cached response or None if missing or expired.
+    """
+    return _response_cache.get((collection, key))
+
+
+def set_cached_response(collection: str, key: Hashable, value: Any) -> None:
+    """
+    Store a response for a collection.
+
+    Args:
+        collection: Collection name.
+        key: Endpoint-specific key (endpoint name and query params).
+        value: Response to cache.
+    """
+    _response_cache[(collection, key)] = value
+
+
+def invalidate_collection(collection: str) -> None:
+    """
+    Drop all cached responses for a collection.
+
+    Args:
+        collection: Collection name.
+    """
+    stale_keys = [key for key in list(_response_cache.keys()) if key[0] == collection]
+    for key in stale_keys:
+        _response_cache.pop(key, None)
@@ -0,0 +1,114 @@
+"""
+Semantic cache for search results.
+Serves a query from a recent search whose embedding is close enough,
+skipping the Qdrant round-trip for near-duplicate queries.
+"""
+
+import time
+from typing import Any, Hashable, List, Optional
+
+import numpy as np
+
+from config import get_settings
+
+
+class SemanticCache:
+    """
+    Ring buffer of recent (query embedding, results) pairs.
+    Lookups compare the query against every cached embedding with a single
+    matrix-vector product and only match entries in the same namespace.
+    """
+
+    def __init__(self, size: int, threshold: float, ttl: float):
+        self.size = size
+        self.threshold = threshold
+        self.ttl = ttl
+        # Allocated on first insert, once the embedding dimension is known
+        self._embeddings: Optional[np.ndarray] = None
+        self._namespaces: List[Optional[Hashable]] = [None] * size
+        self._results: List[Any] = [None] * size
+        self._expires_at = np.zeros(size)
+        self._next_slot = 0
+
+    @staticmethod
+    def _normalize(embedding: Any) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, namespace: Hashable, embedding: Any) -> Optional[Any]:
+        """
+        Get cached results for a query.
+
+        Args:
+            namespace: Key for everything besides the query that shapes the
+                results (collection, mode, filters, limit).
+            embedding: Query embedding.
+
+        Returns:
+            Cached results or None on a miss.
+        """
+        if self._embeddings is None:
+            return None
+
+        query = self._normalize(embedding)
+        if query.shape[0] != self._embeddings.shape[1]:
+            return None
+
+        valid = self._expires_at > time.monotonic()
+        valid &= np.fromiter(
+            (ns == namespace for ns in self._namespaces), dtype=bool, count=self.size
+        )
+        if not valid.any():
+            return None
+
+        similarities = np.where(valid, self._embeddings @ query, -np.inf)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._results[best]
+
+    def put(self, namespace: Hashable, embedding: Any, results: Any) -> None:
+        """
+        Cache results for a query, evicting the oldest entry when full.
+
+        Args:
+            namespace: Key for everything besides the query that shapes the results.
+            embedding: Query embedding.
+            results: Results to cache.
+        """
+        query = self._normalize(embedding)
+        if self._embeddings is None or self._embeddings.shape[1] != query.shape[0]:
+            self._embeddings = np.zeros((self.size, query.shape[0]), dtype=np.float32)
+            self._expires_at[:] = 0
+
+        slot = self._next_slot
+        self._embeddings[slot] = query
+        self._namespaces[slot] = namespace
+        self._results[slot] = results
+        self._expires_at[slot] = time.monotonic() + self.ttl
+        self._next_slot = (slot + 1) % self.size
+
+    def invalidate_collection(self, collection: str) -> None:
+        """
+        Drop cached results for a collection.
+        Namespaces are tuples whose first element is the collection name.
+
+        Args:
+            collection: Collection name.
+        """
+        for slot, namespace in enumerate(self._namespaces):
+            if namespace is not None and namespace[0] == collection:
+                self._namespaces[slot] = None
+                self._results[slot] = None
+                self._expires_at[slot] = 0
+
+
+_settings = get_settings()
+
+# Global semantic cache for search results
+semantic_cache = SemanticCache(
+    size=_settings.semantic_cache_size,
+    threshold=_settings.semantic_cache_threshold,
+    ttl=_settings.semantic_cache_ttl,
+)
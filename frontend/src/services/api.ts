@@ -35,6 +35,11 @@ export interface Entity {
   metadata: Record<string, any>;
 }
 
+export interface EntityPage {
+  entities: Entity[];
+  next_cursor: string | null;
+}
+
 export interface Relation {
   id: string;
   from_entity: string;
@@ -55,6 +60,7 @@ export interface SearchResult {
 export interface SearchResponse {
   results: SearchResult[];
   total: number;
+  has_more: boolean;
   query: string;
   mode: 'semantic' | 'keyword' | 'hybrid';
   took_ms: number;
@@ -108,6 +114,13 @@ export interface ImplementationResponse {
   scope: 'minimal' | 'logical' | 'dependencies';
 }
 
+export interface WSMessage {
+  type: 'ping' | 'pong' | 'update' | 'error' | 'subscribe' | 'unsubscribe';
+  collection: string | null;
+  data: Record<string, any> | null;
+  timestamp: number; // nanoseconds since epoch
+}
+
 // API functions
 
 // Collections
@@ -173,8 +186,8 @@ export const getEntities = async (params: {
   collection: string;
   entity_types?: string[];
   limit?: number;
-  offset?: number;
-}): Promise<Entity[]> => {
+  cursor?: string;
+}): Promise<EntityPage> => {
   const response = await api.get('/entities', { params });
   return response.data;
 };
@@ -254,4 +267,7 @@ export const createWebSocketConnection = (clientId: string): WebSocket => {
   return new WebSocket(`${protocol}//${host}/ws/${clientId}`);
 };
 
+export const wsMessageTime = (message: WSMessage): Date =>
+  new Date(message.timestamp / 1e6);
+
 export default api;
\ No newline at end of file